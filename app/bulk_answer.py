@@ -0,0 +1,245 @@
+import os
+import csv
+import sys
+import json
+import time
+import random
+import argparse
+from contextlib import nullcontext
+from itertools import chain, islice
+from multiprocessing import Pool
+
+import faiss
+import numpy as np
+
+from krishna_chatgpt import load_all_scriptures, create_vector_db, generate_enriched_response
+
+
+QUESTION_FIELDS = ("input", "prompt", "question", "Question")
+
+
+# ========================
+# 📜 QUESTION STREAMS
+# ========================
+def _warn(message):
+    print(f"⚠️ {message}", file=sys.stderr)
+
+
+def _pick_question(record, field=None):
+    """Return the question text of a record, or None if it has none"""
+    if field:
+        value = record.get(field)
+    else:
+        value = next((record[key] for key in QUESTION_FIELDS if record.get(key)), None)
+    return value.strip() if isinstance(value, str) and value.strip() else None
+
+
+def _iter_records(path, f):
+    """Yield (record number, record) pairs, skipping records that cannot be parsed"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        yield from enumerate(csv.DictReader(f), 1)
+    elif ext == ".json":
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}: invalid JSON: {e}") from e
+        if not isinstance(data, list):
+            raise ValueError(f"{path}: expected a JSON array of records, got {type(data).__name__}")
+        yield from enumerate(data, 1)
+    else:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except json.JSONDecodeError as e:
+                _warn(f"{path}:{line_no}: skipping malformed JSON ({e})")
+
+
+def read_questions(path, field=None):
+    """Stream (record number, question) pairs from a JSONL, JSON array or CSV file
+
+    The record number is the 1-based line for JSONL, array position for JSON and data row for CSV.
+    """
+    missing = 0
+    # utf-8-sig drops the BOM Excel puts in front of the first CSV header
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for record_no, record in _iter_records(path, f):
+            if not isinstance(record, dict):
+                _warn(f"{path}:{record_no}: skipping record that is not an object")
+                continue
+            question = _pick_question(record, field)
+            if question:
+                yield record_no, question
+            else:
+                missing += 1
+
+    if missing:
+        where = f"field '{field}'" if field else "a question field"
+        _warn(f"{path}: skipped {missing} record(s) without {where}")
+
+
+def batched(iterable, size):
+    """Yield lists of up to ``size`` items"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+# ========================
+# 🔍 BATCHED RETRIEVAL
+# ========================
+_symmetric_embedders = {}
+
+
+def _embeds_queries_as_documents(embedder, sample):
+    """Check once per embedder whether ``embed_query`` agrees with ``embed_documents``"""
+    key = id(embedder)
+    if key not in _symmetric_embedders:
+        query = np.asarray(embedder.embed_query(sample), dtype=np.float32)
+        document = np.asarray(embedder.embed_documents([sample])[0], dtype=np.float32)
+        # Keep the embedder alive so its id cannot be reused by another object
+        _symmetric_embedders[key] = (embedder, np.allclose(query, document, atol=1e-6))
+    return _symmetric_embedders[key][1]
+
+
+def embed_queries(embedder, questions):
+    """Embed questions the way ``similarity_search`` does, in one forward pass when possible"""
+    if not hasattr(embedder, "embed_query"):
+        return [embedder(question) for question in questions]
+    if _embeds_queries_as_documents(embedder, questions[0]):
+        return embedder.embed_documents(questions)
+    # Query/passage-style models (e.g. e5) encode queries differently, so embed them one by one
+    return [embedder.embed_query(question) for question in questions]
+
+
+def retrieve_batch(vector_db, questions, k=3):
+    """Embed and search a batch of questions at once
+
+    Queries are embedded like ``vector_db.similarity_search`` does, so results match the UI.
+    """
+    vectors = embed_queries(vector_db.embedding_function, questions)
+
+    vectors = np.array(vectors, dtype=np.float32)
+    if getattr(vector_db, "_normalize_L2", False):
+        faiss.normalize_L2(vectors)
+    _, indices = vector_db.index.search(vectors, k)
+
+    results = []
+    for row in indices:
+        docs = [vector_db.docstore.search(vector_db.index_to_docstore_id[i]) for i in row if i != -1]
+        results.append([doc.page_content for doc in docs])
+    return results
+
+
+# ========================
+# 🪔 ANSWER WORKERS
+# ========================
+def answer_item(item):
+    """Generate one answer with its own seeded RNG so output does not depend on scheduling"""
+    record_no, question, scriptures, seed, retrieval_seconds = item
+    start_time = time.perf_counter()
+    rng = random.Random(f"{seed}:{record_no}")
+    response = generate_enriched_response(question, None, rng=rng, scriptures=scriptures)
+    return {
+        "record": record_no,
+        "question": question,
+        "response": response,
+        "retrieval_seconds_batch_avg": round(retrieval_seconds, 6),
+        "generation_seconds": round(time.perf_counter() - start_time, 6),
+    }
+
+
+def iter_batches(questions, vector_db, batch_size, seed, k):
+    """Retrieve scriptures batch by batch and yield the worker items of each batch"""
+    for batch in batched(questions, batch_size):
+        start_time = time.perf_counter()
+        retrieved = retrieve_batch(vector_db, [question for _, question in batch], k=k)
+        per_item = (time.perf_counter() - start_time) / len(batch)
+        yield [
+            (record_no, question, scriptures, seed, per_item)
+            for (record_no, question), scriptures in zip(batch, retrieved)
+        ]
+
+
+def bulk_answer(input_path, output_path, field=None, batch_size=32, workers=1, seed=0, k=3, vector_db=None):
+    """Answer every question in ``input_path`` and write results to ``output_path`` as JSONL
+
+    The output file is overwritten. Only one batch is retrieved ahead of the writer, so memory
+    stays flat however large the input is.
+    """
+    # Read the first question before building the index, so a bad input fails fast
+    # and leaves any existing output untouched
+    questions = read_questions(input_path, field)
+    first = next(questions, None)
+    if first is None:
+        return 0
+
+    if vector_db is None:
+        print("🌿 Loading divine knowledge from sacred scriptures...")
+        vector_db = create_vector_db(load_all_scriptures())
+
+    batches = iter_batches(chain([first], questions), vector_db, batch_size, seed, k)
+
+    count = 0
+    # Pool.__exit__ terminates the workers, so errors and Ctrl-C do not wait on queued work
+    with open(output_path, "w", encoding="utf-8") as out, \
+            (Pool(processes=workers) if workers > 1 else nullcontext()) as pool:
+        for items in batches:
+            results = pool.imap(answer_item, items) if pool else map(answer_item, items)
+            for result in results:
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                count += 1
+            out.flush()
+
+    print(f"✅ {count} answers saved: {output_path}")
+    return count
+
+
+# === MAIN ===
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Answer questions in bulk with Krishna Divine Wisdom")
+    parser.add_argument("input", help="Questions file (.jsonl, .json or .csv)")
+    parser.add_argument("output", help="Where to write answers (.jsonl, overwritten)")
+    parser.add_argument("--field", help="Record field holding the question (default: input/prompt/question/Question)")
+    parser.add_argument("--batch-size", type=int, default=32, help="Questions per retrieval batch")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Processes generating responses (default: 1). Retrieval always runs in the main process, "
+             "so extra workers only help if response generation becomes expensive",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for gestures and openings")
+    parser.add_argument("--k", type=int, default=3, help="Scriptures retrieved per question")
+    args = parser.parse_args(argv)
+
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.k < 1:
+        parser.error("--k must be at least 1")
+
+    try:
+        count = bulk_answer(
+            args.input,
+            args.output,
+            field=args.field,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            seed=args.seed,
+            k=args.k,
+        )
+    except (ValueError, OSError) as e:
+        parser.exit(1, f"❌ {e}\n")
+
+    if not count:
+        parser.exit(1, f"❌ No questions found in {args.input}" + (f" under --field {args.field}\n" if args.field else "\n"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -149,14 +149,21 @@ def create_vector_db(scriptures):
 # ========================
 # 🪔 ENRICHED KRISHNA RESPONSES
 # ========================
-def generate_enriched_response(user_query, vector_db):
-    """Generate deep, personalized Krishna responses with scriptural references"""
+def generate_enriched_response(user_query, vector_db, rng=None, scriptures=None):
+    """Generate deep, personalized Krishna responses with scriptural references
+
+    Pass a seeded ``random.Random`` as ``rng`` for reproducible gestures and openings,
+    and already-retrieved ``scriptures`` to skip the vector search.
+    """
+    rng = rng or random
+
     # Get relevant scriptures
-    relevant_docs = vector_db.similarity_search(user_query, k=3)
-    scriptures = [doc.page_content for doc in relevant_docs]
+    if scriptures is None:
+        relevant_docs = vector_db.similarity_search(user_query, k=3)
+        scriptures = [doc.page_content for doc in relevant_docs]
 
     # Response templates
-    gesture = random.choice([
+    gesture = rng.choice([
         "smiles compassionately",
         "gazes with infinite wisdom",
         "places a hand gently on your shoulder",
@@ -165,7 +172,7 @@ def generate_enriched_response(user_query, vector_db):
         "closes eyes in deep contemplation"
     ])
 
-    opening = random.choice([
+    opening = rng.choice([
         "Dear seeker of truth,",
         "Beloved child of eternity,",
         "O noble soul,",
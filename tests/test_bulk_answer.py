@@ -0,0 +1,121 @@
+import os
+import sys
+import json
+
+import pytest
+
+pytest.importorskip("faiss")
+pytest.importorskip("streamlit")
+pytest.importorskip("langchain_community")
+
+from langchain_community.embeddings import DeterministicFakeEmbedding
+from langchain_community.vectorstores import FAISS
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+import bulk_answer  # noqa: E402
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+SCRIPTURES = [
+    "[Bhagavad Gita]\nThe soul is unborn, eternal, everlasting, primeval.",
+    "[Bhagavad Gita]\nPerform your prescribed duties, for action is better than inaction.",
+    "[Upanishads]\nFind your enjoyment in renunciation; do not covet what belongs to others.",
+    "[Bhagavata Purana]\nThe three modes of material nature bind the eternal soul.",
+    "[Bhagavad Gita Vedanta]\nQ: What is dharma?\nA: That which sustains truth and harmony.",
+]
+SCRIPTURES += [f"[Bhagavad Gita Vyasa]\nQ: Question {i}?\nA: Answer {i}." for i in range(50)]
+
+
+class PassageEmbedding(DeterministicFakeEmbedding):
+    """Embeds documents and queries differently, like e5-style models do"""
+
+    def embed_documents(self, texts):
+        return super().embed_documents([f"passage: {text}" for text in texts])
+
+
+QUESTIONS = ["How to overcome fear?", "What is dharma?", "What is the nature of the soul?"]
+
+
+@pytest.fixture(
+    params=[
+        (DeterministicFakeEmbedding, False),
+        (DeterministicFakeEmbedding, True),
+        (PassageEmbedding, False),
+        (PassageEmbedding, True),
+    ],
+    ids=["batched-plain", "batched-normalized", "passage-plain", "passage-normalized"],
+)
+def vector_db(request):
+    embedding_cls, normalize = request.param
+    return FAISS.from_texts(SCRIPTURES, embedding_cls(size=32), normalize_L2=normalize)
+
+
+def test_retrieve_batch_matches_similarity_search(vector_db):
+    batched = bulk_answer.retrieve_batch(vector_db, QUESTIONS, k=3)
+    for question, scriptures in zip(QUESTIONS, batched):
+        assert scriptures == [doc.page_content for doc in vector_db.similarity_search(question, k=3)]
+
+
+def test_retrieve_batch_embeds_symmetric_queries_in_one_pass(monkeypatch):
+    vector_db = FAISS.from_texts(SCRIPTURES, DeterministicFakeEmbedding(size=32))
+    query_calls, document_calls = [], []
+    embed_query = DeterministicFakeEmbedding.embed_query
+    embed_documents = DeterministicFakeEmbedding.embed_documents
+    monkeypatch.setattr(
+        DeterministicFakeEmbedding, "embed_query",
+        lambda self, text: query_calls.append(text) or embed_query(self, text),
+    )
+    monkeypatch.setattr(
+        DeterministicFakeEmbedding, "embed_documents",
+        lambda self, texts: document_calls.append(list(texts)) or embed_documents(self, texts),
+    )
+
+    bulk_answer.retrieve_batch(vector_db, QUESTIONS, k=3)
+
+    # One probe query, then the whole batch through embed_documents
+    assert query_calls == QUESTIONS[:1]
+    assert document_calls[-1] == QUESTIONS
+
+
+def test_seeded_output_is_identical_across_workers(vector_db, tmp_path):
+    questions = os.path.join(DATA_DIR, "geetgpt_finetune_dataset.jsonl")
+    outputs = []
+    for workers in (1, 2):
+        output = tmp_path / f"answers_{workers}.jsonl"
+        bulk_answer.bulk_answer(questions, str(output), batch_size=16, workers=workers, seed=7, vector_db=vector_db)
+        with open(output, encoding="utf-8") as f:
+            outputs.append([(r["record"], r["question"], r["response"]) for r in map(json.loads, f)])
+
+    assert outputs[0]
+    assert outputs[0] == outputs[1]
+
+
+def test_read_questions_skips_bad_records(tmp_path, capsys):
+    path = tmp_path / "questions.jsonl"
+    path.write_text('{"input": "What is dharma?"}\nnot json\n["a list"]\n{"other": 1}\n\n{"prompt": "Why act?"}\n')
+
+    assert list(bulk_answer.read_questions(str(path))) == [(1, "What is dharma?"), (6, "Why act?")]
+    err = capsys.readouterr().err
+    assert f"{path}:2:" in err
+    assert f"{path}:3:" in err
+    assert "skipped 1 record(s)" in err
+
+
+def test_read_questions_strips_csv_bom(tmp_path):
+    path = tmp_path / "questions.csv"
+    path.write_text("input\nWhat is dharma?\n", encoding="utf-8-sig")
+
+    assert list(bulk_answer.read_questions(str(path))) == [(1, "What is dharma?")]
+
+
+def test_missing_input_fails_before_loading_index(tmp_path, monkeypatch):
+    output = tmp_path / "answers.jsonl"
+    output.write_text("previous run\n")
+    monkeypatch.setattr(bulk_answer, "load_all_scriptures", lambda: pytest.fail("index should not be loaded"))
+
+    with pytest.raises(SystemExit) as exc:
+        bulk_answer.main([str(tmp_path / "nope.jsonl"), str(output)])
+
+    assert exc.value.code == 1
+    assert output.read_text() == "previous run\n"